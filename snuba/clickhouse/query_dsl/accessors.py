@@ -15,7 +15,6 @@ from snuba.query.expressions import FunctionCall as FunctionCallExpr
 from snuba.query.expressions import Literal as LiteralExpr
 from snuba.query.matchers import (
     Any,
-    AnyExpression,
     Column,
     FunctionCall,
     Literal,
@@ -64,26 +63,24 @@ def get_project_ids_in_query_ast(
                 if isinstance(lit, LiteralExpr) and isinstance(lit.value, int)
             }
 
-        match = FunctionCall(
-            Param(
-                "operator",
-                Or([String(BooleanFunctions.AND), String(BooleanFunctions.OR)]),
-            ),
-            (Param("lhs", AnyExpression()), Param("rhs", AnyExpression())),
-        ).match(condition)
-        if match is not None:
-            lhs_projects = get_project_ids_in_condition(match.expression("lhs"))
-            rhs_projects = get_project_ids_in_condition(match.expression("rhs"))
-            if lhs_projects is None:
-                return rhs_projects
-            elif rhs_projects is None:
-                return lhs_projects
-            else:
-                return (
-                    lhs_projects & rhs_projects
-                    if match.string("operator") == BooleanFunctions.AND
-                    else lhs_projects | rhs_projects
-                )
+        if (
+            isinstance(condition, FunctionCallExpr)
+            and condition.function_name in (BooleanFunctions.AND, BooleanFunctions.OR)
+            and len(condition.parameters) >= 2
+        ):
+            # Boolean functions can have any number of operands.
+            found: Optional[Set[int]] = None
+            for operand in condition.parameters:
+                operand_projects = get_project_ids_in_condition(operand)
+                if operand_projects is None:
+                    continue
+                elif found is None:
+                    found = operand_projects
+                elif condition.function_name == BooleanFunctions.AND:
+                    found = found & operand_projects
+                else:
+                    found = found | operand_projects
+            return found
 
         return None
 
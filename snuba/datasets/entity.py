@@ -94,6 +94,12 @@ class Entity(ABC):
         """
         return self.__join_relationships
 
+    def get_required_filter_columns(self) -> Sequence[str]:
+        """
+        Returns the columns every query on this entity has to filter on.
+        """
+        return self._required_filter_columns or []
+
     def validate_required_conditions(
         self, query: Query, alias: Optional[str] = None
     ) -> bool:
@@ -26,6 +26,8 @@ class QueryPlanner(ABC, Generic[TPlan]):
     processors, and a strategy to execute the query.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def build_best_plan(self) -> TPlan:
         raise NotImplementedError
@@ -50,6 +52,8 @@ class QueryExecutionPipeline(ABC):
     This component is produced by the QueryPipelineBuilder.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def execute(self) -> QueryResult:
         raise NotImplementedError
@@ -62,6 +66,8 @@ class QueryPipelineBuilder(ABC, Generic[TPlan]):
     composite query.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def build_execution_pipeline(
         self, request: Request, runner: QueryRunner
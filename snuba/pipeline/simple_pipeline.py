@@ -31,6 +31,8 @@ class EntityQueryPlanner(QueryPlanner[ClickhouseQueryPlan]):
     The main use case is for subqueries.
     """
 
+    __slots__ = ["__query", "__settings", "__query_plan_builder"]
+
     def __init__(
         self,
         query: LogicalQuery,
@@ -59,6 +61,8 @@ class SimpleExecutionPipeline(QueryExecutionPipeline):
     Executes a simple (single entity) query.
     """
 
+    __slots__ = ["__request", "__runner", "__query_planner"]
+
     def __init__(
         self, request: Request, runner: QueryRunner, query_planner: EntityQueryPlanner,
     ):
@@ -77,6 +81,8 @@ class SimpleExecutionPipeline(QueryExecutionPipeline):
 
 
 class SimplePipelineBuilder(QueryPipelineBuilder[ClickhouseQueryPlan]):
+    __slots__ = ["__query_plan_builder"]
+
     def __init__(self, query_plan_builder: ClickhouseQueryPlanBuilder) -> None:
         self.__query_plan_builder = query_plan_builder
 
@@ -1,11 +1,9 @@
-from typing import Mapping, Sequence
+from typing import Mapping, Optional, Sequence
 
 from snuba.query.dsl import literals_tuple
 from snuba.query.expressions import Expression, FunctionCall, Literal
 from snuba.query.matchers import AnyExpression
 from snuba.query.matchers import FunctionCall as FunctionCallPattern
-from snuba.query.matchers import Integer
-from snuba.query.matchers import Literal as LiteralPattern
 from snuba.query.matchers import Or, Param, Pattern, String
 
 
@@ -172,30 +170,28 @@ def get_first_level_or_conditions(condition: Expression) -> Sequence[Expression]
     return _get_first_level_conditions(condition, BooleanFunctions.OR)
 
 
-TOP_LEVEL_CONDITIONS = {
-    func_name: Or(
-        [
-            FunctionCallPattern(
-                String(func_name),
-                (Param("left", AnyExpression()), Param("right", AnyExpression())),
-            ),
-            FunctionCallPattern(
-                String("equals"),
-                (
-                    FunctionCallPattern(
-                        String(func_name),
-                        (
-                            Param("left", AnyExpression()),
-                            Param("right", AnyExpression()),
-                        ),
-                    ),
-                    LiteralPattern(Integer(1)),
-                ),
-            ),
-        ]
-    )
-    for func_name in [BooleanFunctions.AND, BooleanFunctions.OR]
-}
+def _get_boolean_operands(
+    condition: Expression, function: str
+) -> Optional[Sequence[Expression]]:
+    """
+    Returns the operands of the boolean function if the condition is
+    `function(...)` or `equals(function(...), 1)`, None otherwise.
+    Any number of operands is accepted since Clickhouse supports
+    variadic AND and OR functions.
+    """
+    if not isinstance(condition, FunctionCall):
+        return None
+    if (
+        condition.function_name == ConditionFunctions.EQ
+        and len(condition.parameters) == 2
+        and isinstance(condition.parameters[0], FunctionCall)
+        and isinstance(condition.parameters[1], Literal)
+        and condition.parameters[1].value == 1
+    ):
+        condition = condition.parameters[0]
+    if condition.function_name == function and len(condition.parameters) >= 2:
+        return condition.parameters
+    return None
 
 
 def _get_first_level_conditions(
@@ -208,15 +204,20 @@ def _get_first_level_conditions(
     were a simple list of conditions.
     In the AST, the condition is a tree, so we need some additional
     logic to extract the operands of the top level AND condition.
+
+    The tree is walked with an explicit stack since a long chain of
+    binary conditions is as deep as it is long.
     """
-    match = TOP_LEVEL_CONDITIONS[function].match(condition)
-    if match is not None:
-        return [
-            *_get_first_level_conditions(match.expression("left"), function),
-            *_get_first_level_conditions(match.expression("right"), function),
-        ]
-    else:
-        return [condition]
+    conditions = []
+    stack = [condition]
+    while stack:
+        current = stack.pop()
+        operands = _get_boolean_operands(current, function)
+        if operands is None:
+            conditions.append(current)
+        else:
+            stack.extend(reversed(operands))
+    return conditions
 
 
 def combine_or_conditions(conditions: Sequence[Expression]) -> Expression:
@@ -237,12 +238,13 @@ def _combine_conditions(conditions: Sequence[Expression], function: str) -> Expr
     # TODO: Make BooleanFunctions an enum for stricter typing.
     assert function in (BooleanFunctions.AND, BooleanFunctions.OR)
     assert len(conditions) > 0
-    if len(conditions) == 1:
-        return conditions[0]
 
-    return binary_condition(
-        function, conditions[0], _combine_conditions(conditions[1:], function)
-    )
+    # Build the right associative chain starting from the last element
+    # instead of recursing on slices of the sequence.
+    combined = conditions[-1]
+    for i in range(len(conditions) - 2, -1, -1):
+        combined = binary_condition(function, conditions[i], combined)
+    return combined
 
 
 CONDITION_MATCH = Or(
@@ -1,16 +1,33 @@
-from collections import OrderedDict
-from typing import Any, Callable, Optional, Sequence, Set, TypeVar
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Generic,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
 
-from snuba.clickhouse.columns import ColumnSet
+from snuba.clickhouse.columns import Array, ColumnSet, FlattenedColumn
 from snuba.datasets.entity import Entity
 from snuba.query.conditions import (
     OPERATOR_TO_FUNCTION,
+    BooleanFunctions,
     binary_condition,
-    combine_and_conditions,
-    combine_or_conditions,
     unary_condition,
 )
-from snuba.query.expressions import Argument, Expression, FunctionCall, Lambda, Literal
+from snuba.query.expressions import (
+    Argument,
+    Column,
+    Expression,
+    FunctionCall,
+    Lambda,
+    Literal,
+)
 from snuba.query.parser.exceptions import ParsingException
 from snuba.query.parser.expressions import parse_expression
 from snuba.query.schema import POSITIVE_OPERATORS, UNARY_OPERATORS
@@ -18,6 +35,14 @@ from snuba.util import is_condition
 
 TExpression = TypeVar("TExpression")
 
+_POSITIVE_OPERATORS = frozenset(POSITIVE_OPERATORS)
+_UNARY_OPERATORS = frozenset(UNARY_OPERATORS)
+
+# Expressions are immutable so the lambda parameter used when unpacking
+# conditions on array columns can be shared by all the conditions.
+_ARRAY_LAMBDA_PARAMETERS = ("x",)
+_ARRAY_LAMBDA_ARGUMENT = Argument(None, "x")
+
 
 class InvalidConditionException(Exception):
     pass
@@ -48,31 +73,95 @@ def parse_conditions(
     simple_condition_builder: Generates a simple condition made by expression on the
       left hand side, an operator and a literal on the right hand side.
     """
-    from snuba.clickhouse.columns import Array
+    ctx = _ParsingContext(
+        operand_builder,
+        and_builder,
+        or_builder,
+        unpack_array_condition_builder,
+        simple_condition_builder,
+        entity.get_data_model(),
+        _get_array_columns(entity),
+        arrayjoin_cols,
+    )
+    return _parse_conditions(ctx, conditions, depth)
+
+
+@lru_cache(maxsize=None)
+def _get_array_columns(entity: Entity) -> Mapping[str, FlattenedColumn]:
+    """
+    Returns the array columns of the entity data model indexed by every
+    name they can be referenced with in a condition.
+    """
+    array_columns = {}
+    for column in entity.get_data_model():
+        if isinstance(column.type, Array):
+            array_columns[column.flattened] = column
+            array_columns[column.escaped] = column
+    return array_columns
+
+
+class _ParsingContext(Generic[TExpression]):
+    """
+    Everything that stays the same while parsing a condition tree, bundled
+    so the recursion only has to pass the context and the current node.
+    """
+
+    __slots__ = [
+        "operand_builder",
+        "and_builder",
+        "or_builder",
+        "unpack_array_condition_builder",
+        "simple_condition_builder",
+        "columns",
+        "array_columns",
+        "arrayjoin_cols",
+    ]
+
+    def __init__(
+        self,
+        operand_builder: Callable[[Any, ColumnSet, Set[str]], TExpression],
+        and_builder: Callable[[Sequence[TExpression]], Optional[TExpression]],
+        or_builder: Callable[[Sequence[TExpression]], Optional[TExpression]],
+        unpack_array_condition_builder: Callable[[TExpression, str, Any], TExpression],
+        simple_condition_builder: Callable[[TExpression, str, Any], TExpression],
+        columns: ColumnSet,
+        array_columns: Mapping[str, FlattenedColumn],
+        arrayjoin_cols: Set[str],
+    ) -> None:
+        self.operand_builder = operand_builder
+        self.and_builder = and_builder
+        self.or_builder = or_builder
+        self.unpack_array_condition_builder = unpack_array_condition_builder
+        self.simple_condition_builder = simple_condition_builder
+        self.columns = columns
+        self.array_columns = array_columns
+        self.arrayjoin_cols = arrayjoin_cols
 
+
+def _parse_conditions(
+    ctx: _ParsingContext[TExpression], conditions: Any, depth: int,
+) -> Optional[TExpression]:
     if not conditions:
         return None
 
+    if depth < 2 and len(conditions) == 1:
+        # A single term in an AND (depth 0) or OR (depth 1) list needs to
+        # be neither deduped nor combined with anything else.
+        return _parse_conditions(ctx, conditions[0], depth + 1)
+
     if depth == 0:
+        sub = []
+        for cond in conditions:
+            parsed = _parse_conditions(ctx, cond, depth + 1)
+            if parsed is not None:
+                sub.append(parsed)
+
+        if not sub:
+            return None
+        if len(sub) == 1:
+            return sub[0]
         # dedupe conditions at top level, but keep them in order
-        sub = OrderedDict(
-            (
-                parse_conditions(
-                    operand_builder,
-                    and_builder,
-                    or_builder,
-                    unpack_array_condition_builder,
-                    simple_condition_builder,
-                    entity,
-                    cond,
-                    arrayjoin_cols,
-                    depth + 1,
-                ),
-                None,
-            )
-            for cond in conditions
-        )
-        return and_builder([s for s in sub.keys() if s])
+        return ctx.and_builder(list(dict.fromkeys(sub)))
     elif is_condition(conditions):
         try:
             lhs, op, lit = conditions
@@ -81,9 +170,10 @@ def parse_conditions(
                 f"Cannot process condition {conditions}", cause
             ) from cause
 
-        # facilitate deduping IN conditions by sorting them.
-        if op in ("IN", "NOT IN") and isinstance(lit, tuple):
-            lit = tuple(sorted(lit))
+        # facilitate deduping IN conditions by sorting them and removing
+        # repeated values from the tuple.
+        if op in ("IN", "NOT IN") and isinstance(lit, (list, tuple)):
+            lit = _dedupe_in_literals(lit)
 
         # If the LHS is a simple column name that refers to an array column
         # (and we are not arrayJoining on that column, which would make it
@@ -94,137 +184,289 @@ def parse_conditions(
         # (IN, =, LIKE) are looking for rows where any array value matches, and
         # exclusionary operators (NOT IN, NOT LIKE, !=) are looking for rows
         # where all elements match (eg. all NOT LIKE 'foo').
-        columns = entity.get_data_model()
+        array_column = ctx.array_columns.get(lhs) if isinstance(lhs, str) else None
         if (
-            isinstance(lhs, str)
-            and lhs in columns
-            and isinstance(columns[lhs].type, Array)
-            and columns[lhs].base_name not in arrayjoin_cols
-            and columns[lhs].flattened not in arrayjoin_cols
+            array_column is not None
+            and array_column.base_name not in ctx.arrayjoin_cols
+            and array_column.flattened not in ctx.arrayjoin_cols
             and not isinstance(lit, (list, tuple))
         ):
-            return unpack_array_condition_builder(
-                operand_builder(lhs, entity.get_data_model(), arrayjoin_cols), op, lit,
+            return ctx.unpack_array_condition_builder(
+                ctx.operand_builder(lhs, ctx.columns, ctx.arrayjoin_cols), op, lit,
             )
         else:
-            return simple_condition_builder(
-                operand_builder(lhs, entity.get_data_model(), arrayjoin_cols), op, lit,
+            if (
+                op == "IN"
+                and array_column is None
+                and isinstance(lit, (list, tuple))
+                and len(lit) == 1
+                and lit[0] is not None
+                and not isinstance(lit[0], (list, tuple))
+            ):
+                # An IN condition on a single value is an equality, which is
+                # cheaper to evaluate and to process. NOT IN is kept as it is
+                # so the way NULL values are filtered does not change.
+                # Longer lists are not expanded into an OR of equalities:
+                # processors like the arrayjoin key optimizer and the query
+                # splitter only recognize IN and equality conditions at the
+                # top level, and Clickhouse uses the primary key for IN.
+                op, lit = "=", lit[0]
+            return ctx.simple_condition_builder(
+                ctx.operand_builder(lhs, ctx.columns, ctx.arrayjoin_cols), op, lit,
             )
 
     elif depth == 1:
-        sub_expression = (
-            parse_conditions(
-                operand_builder,
-                and_builder,
-                or_builder,
-                unpack_array_condition_builder,
-                simple_condition_builder,
-                entity,
-                cond,
-                arrayjoin_cols,
-                depth + 1,
-            )
-            for cond in conditions
-        )
-        return or_builder([s for s in sub_expression if s])
+        sub_expression = [
+            _parse_conditions(ctx, cond, depth + 1) for cond in conditions
+        ]
+        return ctx.or_builder([s for s in sub_expression if s is not None])
     else:
         raise InvalidConditionException(str(conditions))
 
 
-def parse_conditions_to_expr(
-    expr: Sequence[Any], entity: Entity, arrayjoin: Set[str]
+def _dedupe_in_literals(literals: Sequence[Any]) -> Sequence[Any]:
+    """
+    Removes repeated values from the right hand side of an IN condition and
+    sorts them when they can be compared with each other.
+    """
+    try:
+        unique = set(literals)
+    except TypeError:
+        # Nested lists cannot be hashed, leave the values alone.
+        return literals
+    try:
+        return tuple(sorted(unique))
+    except TypeError:
+        # Values of mixed types. Keep the order they were provided in.
+        return tuple(dict.fromkeys(literals))
+
+
+def _boolean_builder(
+    function: str, expressions: Sequence[Expression]
 ) -> Optional[Expression]:
     """
-    Relies on parse_conditions to parse a list of conditions into an Expression.
+    Clickhouse and/or functions are variadic, so all the operands go into
+    a single function call instead of a chain of binary ones.
     """
+    if not expressions:
+        return None
+    if len(expressions) == 1:
+        return expressions[0]
+    return FunctionCall(None, function, tuple(expressions))
 
-    def and_builder(expressions: Sequence[Expression]) -> Optional[Expression]:
-        if not expressions:
-            return None
-        return combine_and_conditions(expressions)
 
-    def or_builder(expressions: Sequence[Expression]) -> Optional[Expression]:
-        if not expressions:
-            return None
-        return combine_or_conditions(expressions)
-
-    def preprocess_literal(op: str, literal: Any) -> Expression:
-        """
-        Replaces lists with a function call to tuple.
-        """
-        if isinstance(literal, (list, tuple)):
-            if op not in ["IN", "NOT IN"]:
-                raise ParsingException(
-                    (
-                        f"Invalid operator {op} for literal {literal}. Literal is a sequence. "
-                        "Operator must be IN/NOT IN"
-                    )
+def _and_builder(expressions: Sequence[Expression]) -> Optional[Expression]:
+    return _boolean_builder(BooleanFunctions.AND, expressions)
+
+
+def _or_builder(expressions: Sequence[Expression]) -> Optional[Expression]:
+    return _boolean_builder(BooleanFunctions.OR, expressions)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _cached_literal(value: Union[bool, int, float, str]) -> Literal:
+    return Literal(None, value)
+
+
+def _literal(value: Any) -> Literal:
+    """
+    Literal nodes are immutable and the same small values (project ids,
+    platforms, etc.) show up in most queries, so the nodes for simple
+    scalar values are shared instead of being allocated every time.
+    """
+    if isinstance(value, (bool, int, float, str)):
+        return _cached_literal(value)
+    return Literal(None, value)
+
+
+def _preprocess_literal(op: str, literal: Any) -> Expression:
+    """
+    Replaces lists with a function call to tuple.
+    """
+    if isinstance(literal, (list, tuple)):
+        if op not in ["IN", "NOT IN"]:
+            raise ParsingException(
+                (
+                    f"Invalid operator {op} for literal {literal}. Literal is a sequence. "
+                    "Operator must be IN/NOT IN"
                 )
-            literals = tuple([Literal(None, lit) for lit in literal])
-            return FunctionCall(None, "tuple", literals)
-        else:
-            if op in ["IN", "NOT IN"]:
-                raise ParsingException(
-                    (
-                        f"Invalid operator {op} for literal {literal}. Literal is not a sequence. "
-                        "Operator cannot be IN/NOT IN"
-                    )
+            )
+        literals = tuple([_literal(lit) for lit in literal])
+        return FunctionCall(None, "tuple", literals)
+    else:
+        if op in ["IN", "NOT IN"]:
+            raise ParsingException(
+                (
+                    f"Invalid operator {op} for literal {literal}. Literal is not a sequence. "
+                    "Operator cannot be IN/NOT IN"
                 )
-            return Literal(None, literal)
-
-    def unpack_array_condition_builder(
-        lhs: Expression, op: str, literal: Any
-    ) -> Expression:
-        function_name = "arrayExists" if op in POSITIVE_OPERATORS else "arrayAll"
-
-        # This is an expression like:
-        # arrayExists(x -> assumeNotNull(notLike(x, rhs)), lhs)
-        return FunctionCall(
-            None,
-            function_name,
-            (
-                Lambda(
+            )
+        return _literal(literal)
+
+
+def _unpack_array_condition_builder(
+    lhs: Expression, op: str, literal: Any
+) -> Expression:
+    function_name = "arrayExists" if op in _POSITIVE_OPERATORS else "arrayAll"
+
+    # This is an expression like:
+    # arrayExists(x -> assumeNotNull(notLike(x, rhs)), lhs)
+    return FunctionCall(
+        None,
+        function_name,
+        (
+            Lambda(
+                None,
+                _ARRAY_LAMBDA_PARAMETERS,
+                FunctionCall(
                     None,
-                    ("x",),
-                    FunctionCall(
-                        None,
-                        "assumeNotNull",
-                        (
-                            FunctionCall(
-                                None,
-                                OPERATOR_TO_FUNCTION[op],
-                                (Argument(None, "x"), preprocess_literal(op, literal)),
-                            ),
+                    "assumeNotNull",
+                    (
+                        FunctionCall(
+                            None,
+                            OPERATOR_TO_FUNCTION[op],
+                            (_ARRAY_LAMBDA_ARGUMENT, _preprocess_literal(op, literal)),
                         ),
                     ),
                 ),
-                lhs,
             ),
-        )
+            lhs,
+        ),
+    )
 
-    def simple_condition_builder(lhs: Expression, op: str, literal: Any) -> Expression:
-        if op in UNARY_OPERATORS:
-            if literal is not None:
-                raise ParsingException(
-                    f"Right hand side operand {literal} provided to unary operator {op}"
-                )
-            return unary_condition(OPERATOR_TO_FUNCTION[op], lhs)
 
-        else:
-            if literal is None:
-                raise ParsingException(
-                    f"Missing right hand side operand for binary operator {op}"
-                )
-            return binary_condition(
-                OPERATOR_TO_FUNCTION[op], lhs, preprocess_literal(op, literal)
+def _simple_condition_builder(
+    lhs: Expression,
+    op: str,
+    literal: Any,
+    required_columns: FrozenSet[str] = frozenset(),
+) -> Expression:
+    if op in _UNARY_OPERATORS:
+        if literal is not None:
+            raise ParsingException(
+                f"Right hand side operand {literal} provided to unary operator {op}"
+            )
+        return unary_condition(OPERATOR_TO_FUNCTION[op], lhs)
+
+    else:
+        if literal is None:
+            raise ParsingException(
+                f"Missing right hand side operand for binary operator {op}"
             )
+        if (
+            op in ("IN", "NOT IN")
+            and isinstance(literal, (list, tuple))
+            and not literal
+            and not (isinstance(lhs, Column) and lhs.column_name in required_columns)
+        ):
+            # Nothing is in an empty set, so the condition is a constant.
+            # This also avoids sending an empty tuple() to Clickhouse.
+            # Conditions on the columns the entity requires a filter on are
+            # kept since the required conditions validation looks for them.
+            return _literal(op == "NOT IN")
+        return binary_condition(
+            OPERATOR_TO_FUNCTION[op], lhs, _preprocess_literal(op, literal)
+        )
+
+
+@lru_cache(maxsize=None)
+def _get_simple_condition_builder(
+    entity: Entity,
+) -> Callable[[Expression, str, Any], Expression]:
+    return partial(
+        _simple_condition_builder,
+        required_columns=frozenset(entity.get_required_filter_columns()),
+    )
+
+
+# Conditions holding more values than this (usually long IN lists) are not
+# cached. Each cache entry keeps the frozen conditions and the expression
+# alive, and for these the lookup saves little over parsing them again.
+_MAX_CACHEABLE_VALUES = 256
+
+
+class _NotCacheable(Exception):
+    pass
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Builds a hashable representation of a legacy condition structure.
+    The type of each element is preserved since the parser treats lists
+    and tuples differently and `1`, `1.0` and `True` must not collide.
 
+    Raises _NotCacheable if the structure contains too many values or a
+    value that cannot be hashed.
+    """
+    remaining = _MAX_CACHEABLE_VALUES
+
+    def freeze(value: Any) -> Any:
+        nonlocal remaining
+        if isinstance(value, (list, tuple)):
+            return (type(value), tuple(freeze(v) for v in value))
+        if isinstance(value, dict):
+            return (dict, tuple((k, freeze(v)) for k, v in value.items()))
+        remaining -= 1
+        if remaining < 0:
+            raise _NotCacheable
+        try:
+            hash(value)
+        except TypeError as cause:
+            raise _NotCacheable from cause
+        return (type(value), value)
+
+    return freeze(value)
+
+
+def _thaw(frozen: Any) -> Any:
+    """
+    Rebuilds the condition structure _freeze was given.
+    """
+    kind, value = frozen
+    if issubclass(kind, list):
+        return [_thaw(v) for v in value]
+    if issubclass(kind, tuple):
+        return tuple(_thaw(v) for v in value)
+    if kind is dict:
+        return {k: _thaw(v) for k, v in value}
+    return value
+
+
+def parse_conditions_to_expr(
+    expr: Sequence[Any], entity: Entity, arrayjoin: Set[str]
+) -> Optional[Expression]:
+    """
+    Relies on parse_conditions to parse a list of conditions into an Expression.
+
+    The same conditions are sent over and over (dashboards, alerts) so the
+    result is cached. Expressions are immutable, thus sharing the same tree
+    across queries is safe.
+    """
+    try:
+        conditions = _freeze(expr)
+    except _NotCacheable:
+        return _parse_conditions_to_expr(expr, entity, arrayjoin)
+
+    return _parse_conditions_to_expr_cached(conditions, entity, frozenset(arrayjoin))
+
+
+@lru_cache(maxsize=4096)
+def _parse_conditions_to_expr_cached(
+    conditions: Any, entity: Entity, arrayjoin: FrozenSet[str]
+) -> Optional[Expression]:
+    # Only the frozen form is kept by the cache, not the caller's conditions.
+    return _parse_conditions_to_expr(_thaw(conditions), entity, set(arrayjoin))
+
+
+def _parse_conditions_to_expr(
+    expr: Sequence[Any], entity: Entity, arrayjoin: Set[str]
+) -> Optional[Expression]:
     return parse_conditions(
         parse_expression,
-        and_builder,
-        or_builder,
-        unpack_array_condition_builder,
-        simple_condition_builder,
+        _and_builder,
+        _or_builder,
+        _unpack_array_condition_builder,
+        _get_simple_condition_builder(entity),
         entity,
         expr,
         arrayjoin,
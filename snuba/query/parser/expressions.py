@@ -173,10 +173,10 @@ def parse_expression(
     Parse a simple or structured expression encoded in the Snuba query language
     into an AST Expression.
     """
-    if is_function(val, 0):
-        return parse_function_to_expr(val, dataset_columns, arrayjoin)
     if isinstance(val, str):
         return parse_string_to_expr(val)
+    if is_function(val, 0):
+        return parse_function_to_expr(val, dataset_columns, arrayjoin)
     raise ParsingException(
         f"Expression to parse can only be a function or a string: {val}"
     )
@@ -5,6 +5,8 @@ from snuba.query.expressions import (
 )
 from snuba.util import QUOTED_LITERAL_RE
 
+_QUOTED_LITERAL_MATCH = QUOTED_LITERAL_RE.match
+
 
 def parse_string_to_expr(val: str) -> Expression:
     """
@@ -16,11 +18,14 @@ def parse_string_to_expr(val: str) -> Expression:
     # a column or a literal.
     if val.isdigit():
         return Literal(None, int(val))
-    else:
-        try:
-            return Literal(None, float(val))
-        except Exception:
-            if QUOTED_LITERAL_RE.match(val):
-                return Literal(None, val[1:-1])
-            else:
-                return Column(None, None, val)
+    if _QUOTED_LITERAL_MATCH(val):
+        return Literal(None, val[1:-1])
+    if val[:1].isalpha() and val[0] not in "iInN":
+        # Most strings are column names. A string starting with a letter
+        # can only be a float if it is "inf", "infinity" or "nan", so skip
+        # raising and catching an exception in float() for all the others.
+        return Column(None, None, val)
+    try:
+        return Literal(None, float(val))
+    except ValueError:
+        return Column(None, None, val)
@@ -7,7 +7,6 @@ from snuba.query.conditions import (
     ConditionFunctions,
     get_first_level_and_conditions,
     in_condition,
-    is_binary_condition,
     is_in_condition_pattern,
 )
 from snuba.query.dsl import arrayJoin, tupleElement
@@ -57,7 +56,7 @@ def _get_mapping_keys_in_condition(
 
     conditions = get_first_level_and_conditions(condition)
     for c in conditions:
-        if is_binary_condition(c, BooleanFunctions.OR):
+        if isinstance(c, FunctionCallExpr) and c.function_name == BooleanFunctions.OR:
             return None
 
         match = FunctionCall(
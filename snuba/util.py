@@ -42,6 +42,8 @@ PART_RE = r"\('(?P<timestamp>\d{4}-\d{2}-\d{2})',\s*(?P<retention>\d+)\)"
 QUOTED_LITERAL_RE = re.compile(r"^'[\s\S]*'$")
 SAFE_FUNCTION_RE = re.compile(r"-?[a-zA-Z_][a-zA-Z0-9_]*$")
 
+_CONDITION_OPERATORS = frozenset(CONDITION_OPERATORS)
+
 
 def to_list(value: Union[T, List[T]]) -> List[T]:
     return value if isinstance(value, list) else [value]
@@ -104,7 +106,8 @@ def is_condition(cond_or_list: Sequence[Any]) -> bool:
         len(cond_or_list) == 3
         and
         # where the middle element is an operator
-        cond_or_list[1] in CONDITION_OPERATORS
+        isinstance(cond_or_list[1], str)
+        and cond_or_list[1] in _CONDITION_OPERATORS
         and
         # and the first element looks like a column name or expression
         isinstance(cond_or_list[0], (str, tuple, list))
@@ -1,9 +1,17 @@
 from typing import Any, MutableMapping, Set
 
 import pytest
+from snuba.clickhouse.query import Query as ClickhouseQuery
 from snuba.clickhouse.query_dsl.accessors import get_project_ids_in_query_ast
 from snuba.datasets.factory import get_dataset
 from snuba.datasets.plans.translator.query import identity_translate
+from snuba.query.conditions import (
+    BooleanFunctions,
+    ConditionFunctions,
+    binary_condition,
+    in_condition,
+)
+from snuba.query.expressions import Column, FunctionCall, Literal
 from snuba.query.parser import parse_query
 
 test_cases = [
@@ -140,3 +148,33 @@ def test_find_projects(
     query = identity_translate(parse_query(query_body, events))
     project_ids_ast = get_project_ids_in_query_ast(query, "project_id")
     assert project_ids_ast == expected_projects
+
+
+def test_find_projects_variadic_conditions() -> None:
+    def project_in(*projects: int) -> FunctionCall:
+        return in_condition(
+            Column(None, None, "project_id"), [Literal(None, p) for p in projects]
+        )
+
+    query = ClickhouseQuery(
+        None,
+        selected_columns=[],
+        condition=FunctionCall(
+            None,
+            BooleanFunctions.AND,
+            (
+                project_in(100, 200, 300),
+                binary_condition(
+                    ConditionFunctions.EQ,
+                    Column(None, None, "column1"),
+                    Literal(None, "something"),
+                ),
+                FunctionCall(
+                    None,
+                    BooleanFunctions.OR,
+                    (project_in(100), project_in(200), project_in(400)),
+                ),
+            ),
+        ),
+    )
+    assert get_project_ids_in_query_ast(query, "project_id") == {100, 200}
@@ -5,11 +5,13 @@ from typing import Generator, Optional
 from snuba import state
 from snuba.datasets.entities import EntityKey
 from snuba.datasets.entities.factory import get_entity
+from snuba.datasets.factory import get_dataset
 from snuba.query import SelectedExpression
 from snuba.query.conditions import binary_condition
 from snuba.query.data_source.simple import Entity as QueryEntity
 from snuba.query.expressions import Column, Expression, FunctionCall, Literal
 from snuba.query.logical import Query as LogicalQuery
+from snuba.query.parser import parse_query
 
 tests = [
     pytest.param(
@@ -426,3 +428,20 @@ def test_entity_validation_failure(
     )
 
     assert not entity.validate_required_conditions(query)
+
+
+def test_entity_validation_empty_project_list() -> None:
+    # An empty IN on a required column must survive parsing, so the query
+    # is not rejected for missing a project_id condition.
+    query = parse_query(
+        {
+            "selected_columns": ["event_id"],
+            "conditions": [
+                ["project_id", "IN", []],
+                ["timestamp", ">=", datetime.datetime(2021, 1, 1, 0, 0)],
+                ["timestamp", "<", datetime.datetime(2021, 1, 2, 0, 0)],
+            ],
+        },
+        get_dataset("events"),
+    )
+    assert get_entity(EntityKey.EVENTS).validate_required_conditions(query)
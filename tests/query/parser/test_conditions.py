@@ -74,23 +74,17 @@ test_conditions = [
                 ),
                 FunctionCall(
                     None,
-                    BooleanFunctions.AND,
-                    (
-                        FunctionCall(
-                            None,
-                            ConditionFunctions.EQ,
-                            (Column(None, None, "b"), Literal(None, 2)),
-                        ),
-                        FunctionCall(
-                            None,
-                            ConditionFunctions.EQ,
-                            (Column(None, None, "c"), Literal(None, 3)),
-                        ),
-                    ),
+                    ConditionFunctions.EQ,
+                    (Column(None, None, "b"), Literal(None, 2)),
+                ),
+                FunctionCall(
+                    None,
+                    ConditionFunctions.EQ,
+                    (Column(None, None, "c"), Literal(None, 3)),
                 ),
             ),
         ),
-    ),  # Odd number of conditions. Right associative expression
+    ),  # Odd number of conditions. A single variadic and
     (
         [[["a", "=", 1], ["b", "=", 2]]],
         FunctionCall(
@@ -123,23 +117,17 @@ test_conditions = [
                 ),
                 FunctionCall(
                     None,
-                    BooleanFunctions.OR,
-                    (
-                        FunctionCall(
-                            None,
-                            ConditionFunctions.EQ,
-                            (Column(None, None, "b"), Literal(None, 2)),
-                        ),
-                        FunctionCall(
-                            None,
-                            ConditionFunctions.EQ,
-                            (Column(None, None, "c"), Literal(None, 3)),
-                        ),
-                    ),
+                    ConditionFunctions.EQ,
+                    (Column(None, None, "b"), Literal(None, 2)),
+                ),
+                FunctionCall(
+                    None,
+                    ConditionFunctions.EQ,
+                    (Column(None, None, "c"), Literal(None, 3)),
                 ),
             ),
         ),
-    ),  # Odd number of conditions. Right associative expression
+    ),  # Odd number of conditions. A single variadic or
     (
         [[["a", "=", 1], ["b", "=", 2]], ["c", "=", 3]],
         FunctionCall(
@@ -488,6 +476,88 @@ test_conditions = [
             ),
         ),
     ),  # Test that a duplicate IN condition is de-duplicated even if the lists are in different orders.
+    (
+        tuplify([["platform", "IN", ["b", "a", "b"]]]),
+        FunctionCall(
+            None,
+            ConditionFunctions.IN,
+            (
+                Column(None, None, "platform"),
+                FunctionCall(None, "tuple", (Literal(None, "a"), Literal(None, "b"))),
+            ),
+        ),
+    ),  # Repeated values are removed from the IN tuple
+    (
+        [["platform", "IN", ["b", "a", "b"]]],
+        FunctionCall(
+            None,
+            ConditionFunctions.IN,
+            (
+                Column(None, None, "platform"),
+                FunctionCall(None, "tuple", (Literal(None, "a"), Literal(None, "b"))),
+            ),
+        ),
+    ),  # Repeated values are removed from an IN list as sent in the request body
+    (
+        [["platform", "IN", [2, "a", 2]]],
+        FunctionCall(
+            None,
+            ConditionFunctions.IN,
+            (
+                Column(None, None, "platform"),
+                FunctionCall(None, "tuple", (Literal(None, 2), Literal(None, "a"))),
+            ),
+        ),
+    ),  # Values of mixed types are deduped without sorting them
+    (
+        [["platform", "IN", ["a"]]],
+        FunctionCall(
+            None,
+            ConditionFunctions.EQ,
+            (Column(None, None, "platform"), Literal(None, "a")),
+        ),
+    ),  # IN a single value becomes an equality
+    (
+        [["platform", "NOT IN", ["a"]]],
+        FunctionCall(
+            None,
+            ConditionFunctions.NOT_IN,
+            (
+                Column(None, None, "platform"),
+                FunctionCall(None, "tuple", (Literal(None, "a"),)),
+            ),
+        ),
+    ),
+    (
+        [["platform", "IN", []]],
+        Literal(None, False),
+    ),  # IN an empty list is always false
+    (
+        [["a", "=", 1], [["platform", "NOT IN", []], ["b", "=", 2]]],
+        FunctionCall(
+            None,
+            BooleanFunctions.AND,
+            (
+                FunctionCall(
+                    None,
+                    ConditionFunctions.EQ,
+                    (Column(None, None, "a"), Literal(None, 1)),
+                ),
+                FunctionCall(
+                    None,
+                    BooleanFunctions.OR,
+                    (
+                        Literal(None, True),
+                        FunctionCall(
+                            None,
+                            ConditionFunctions.EQ,
+                            (Column(None, None, "b"), Literal(None, 2)),
+                        ),
+                    ),
+                ),
+            ),
+        ),
+    ),  # NOT IN an empty list is always true
     (
         [["group_id", "IS NULL", None]],
         FunctionCall(
@@ -514,3 +584,22 @@ def test_invalid_conditions() -> None:
     binary = [["group_id", "=", None]]
     with pytest.raises(Exception):
         parse_conditions_to_expr(binary, entity, set())
+
+
+def test_conditions_cache() -> None:
+    entity = get_entity(EntityKey.EVENTS)
+    conditions = [["a", "=", 1]]
+    parsed = parse_conditions_to_expr(conditions, entity, set())
+    assert parse_conditions_to_expr([["a", "=", 1]], entity, set()) is parsed
+
+    # Equal values of different types must not share the cached expression
+    for literal in (True, 1.0):
+        parsed = parse_conditions_to_expr([["a", "=", literal]], entity, set())
+        assert type(parsed.parameters[1].value) is type(literal)
+
+    # Conditions with too many values are parsed every time.
+    large = [["group_id", "IN", list(range(1000))]]
+    parsed = parse_conditions_to_expr(large, entity, set())
+    reparsed = parse_conditions_to_expr(large, entity, set())
+    assert parsed == reparsed
+    assert parsed is not reparsed
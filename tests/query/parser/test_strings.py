@@ -0,0 +1,32 @@
+import pytest
+
+from snuba.query.expressions import Column, Expression, Literal
+from snuba.query.parser.strings import parse_string_to_expr
+
+test_data = [
+    ("123", Literal(None, 123)),
+    ("-1.5", Literal(None, -1.5)),
+    ("1e3", Literal(None, 1000.0)),
+    ("'quoted string'", Literal(None, "quoted string")),
+    ("'123'", Literal(None, "123")),
+    ("event_id", Column(None, None, "event_id")),
+    ("tags[foo]", Column(None, None, "tags[foo]")),
+    ("_underscore", Column(None, None, "_underscore")),
+    ("ip_address", Column(None, None, "ip_address")),
+    ("", Column(None, None, "")),
+]
+
+
+@pytest.mark.parametrize("value, expected", test_data)
+def test_parse_string(value: str, expected: Expression) -> None:
+    assert parse_string_to_expr(value) == expected
+
+
+def test_parse_special_floats() -> None:
+    infinity = parse_string_to_expr("Infinity")
+    assert isinstance(infinity, Literal)
+    assert infinity.value == float("inf")
+
+    nan = parse_string_to_expr("nan")
+    assert isinstance(nan, Literal)
+    assert nan.value != nan.value
@@ -147,6 +147,56 @@ tags_filter_tests = [
         set(),
         id="tag OR condition",
     ),
+    pytest.param(
+        build_query(
+            selected_columns=[
+                FunctionCall(
+                    "tags_key", "arrayJoin", (Column(None, None, "tags.key"),),
+                ),
+            ],
+            condition=FunctionCall(
+                None,
+                BooleanFunctions.AND,
+                (
+                    binary_condition(
+                        ConditionFunctions.EQ,
+                        FunctionCall(
+                            "tags_key", "arrayJoin", (Column(None, None, "tags.key"),),
+                        ),
+                        Literal(None, "tag"),
+                    ),
+                    binary_condition(
+                        ConditionFunctions.EQ,
+                        Column(None, None, "col"),
+                        Literal(None, "a"),
+                    ),
+                    FunctionCall(
+                        None,
+                        BooleanFunctions.OR,
+                        (
+                            binary_condition(
+                                ConditionFunctions.EQ,
+                                Column(None, None, "col"),
+                                Literal(None, "b"),
+                            ),
+                            binary_condition(
+                                ConditionFunctions.EQ,
+                                Column(None, None, "col"),
+                                Literal(None, "c"),
+                            ),
+                            binary_condition(
+                                ConditionFunctions.EQ,
+                                Column(None, None, "col"),
+                                Literal(None, "d"),
+                            ),
+                        ),
+                    ),
+                ),
+            ),
+        ),
+        set(),
+        id="variadic AND with a variadic OR",
+    ),
 ]
 
 
@@ -249,12 +299,13 @@ test_data = [
                     ),
                 )
             ],
-            condition=in_condition(
+            condition=binary_condition(
+                ConditionFunctions.EQ,
                 arrayJoin(
                     "_snuba_tags_key",
                     filter_keys(Column(None, None, "tags.key"), [Literal(None, "t1")]),
                 ),
-                [Literal(None, "t1")],
+                Literal(None, "t1"),
             ),
         ),
         id="filter on keys only",
@@ -304,7 +355,8 @@ test_data = [
                     ),
                 ),
             ],
-            condition=in_condition(
+            condition=binary_condition(
+                ConditionFunctions.EQ,
                 tupleElement(
                     "_snuba_tags_key",
                     arrayJoin(
@@ -319,7 +371,7 @@ test_data = [
                     ),
                     Literal(None, 1),
                 ),
-                [Literal(None, "t1")],
+                Literal(None, "t1"),
             ),
         ),
         id="filter on key value pars",
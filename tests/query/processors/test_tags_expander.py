@@ -1,6 +1,6 @@
 from snuba.datasets.factory import get_dataset
 from snuba.query import SelectedExpression
-from snuba.query.conditions import OPERATOR_TO_FUNCTION, binary_condition, in_condition
+from snuba.query.conditions import OPERATOR_TO_FUNCTION, binary_condition
 from snuba.query.expressions import Column, FunctionCall, Literal
 from snuba.query.parser import parse_query
 from snuba.query.processors.tags_expander import TagsExpanderProcessor
@@ -76,9 +76,10 @@ def test_tags_expander() -> None:
         Literal(None, "tags_key"),
     )
 
-    assert query.get_having_from_ast() == in_condition(
+    assert query.get_having_from_ast() == binary_condition(
+        OPERATOR_TO_FUNCTION["="],
         FunctionCall(
             "_snuba_tags_value", "arrayJoin", (Column(None, None, "tags.value"),)
         ),
-        [Literal(None, "tag")],
+        Literal(None, "tag"),
     )
@@ -2,6 +2,8 @@ from snuba.query.conditions import (
     BooleanFunctions,
     ConditionFunctions,
     binary_condition,
+    combine_and_conditions,
+    combine_or_conditions,
     get_first_level_and_conditions,
     get_first_level_or_conditions,
     is_binary_condition,
@@ -247,3 +249,52 @@ def test_first_level_conditions() -> None:
         c1,
         binary_condition(BooleanFunctions.AND, c2, c3),
     ]
+
+
+def test_combine_conditions() -> None:
+    conditions = [
+        binary_condition(
+            ConditionFunctions.EQ, Column(None, None, f"column{i}"), Literal(None, i),
+        )
+        for i in range(4)
+    ]
+
+    assert combine_and_conditions(conditions[:1]) == conditions[0]
+    assert combine_or_conditions(conditions) == binary_condition(
+        BooleanFunctions.OR,
+        conditions[0],
+        binary_condition(
+            BooleanFunctions.OR,
+            conditions[1],
+            binary_condition(BooleanFunctions.OR, conditions[2], conditions[3]),
+        ),
+    )
+
+    assert get_first_level_and_conditions(combine_and_conditions(conditions)) == (
+        conditions
+    )
+
+
+def test_first_level_conditions_variadic() -> None:
+    conditions = [
+        binary_condition(
+            ConditionFunctions.EQ, Column(None, None, f"column{i}"), Literal(None, i),
+        )
+        for i in range(4)
+    ]
+
+    cond = FunctionCall(
+        None,
+        BooleanFunctions.AND,
+        (
+            conditions[0],
+            FunctionCall(None, BooleanFunctions.AND, tuple(conditions[1:3])),
+            conditions[3],
+        ),
+    )
+    assert get_first_level_and_conditions(cond) == conditions
+    assert get_first_level_or_conditions(cond) == [cond]
+
+    # Long chains do not hit the recursion limit
+    chain = combine_and_conditions(conditions * 1000)
+    assert len(get_first_level_and_conditions(chain)) == 4000
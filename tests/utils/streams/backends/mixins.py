@@ -2,8 +2,15 @@ import time
 import uuid
 from abc import ABC, abstractmethod
 from contextlib import closing
-from typing import ContextManager, Generic, Iterator, Mapping, Optional, Sequence
-from unittest import mock
+from typing import (
+    ContextManager,
+    Generic,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+)
 
 import pytest
 
@@ -181,9 +188,9 @@ class StreamsTestMixin(ABC, Generic[TPayload]):
 
             consumer = self.get_consumer(group)
 
-            revocation_callback = mock.MagicMock()
+            revocations: MutableSequence[Sequence[Partition]] = []
 
-            consumer.subscribe([topic], on_revoke=revocation_callback)
+            consumer.subscribe([topic], on_revoke=revocations.append)
 
             message = consumer.poll(10.0)  # XXX: getting the subscription is slow
             assert isinstance(message, Message)
@@ -199,7 +206,7 @@ class StreamsTestMixin(ABC, Generic[TPayload]):
             else:
                 raise AssertionError("expected EndOfPartition error")
 
-            with assert_changes(lambda: revocation_callback.called, False, True):
+            with assert_changes(lambda: revocations, [], [[Partition(topic, 0)]]):
                 consumer.close()
 
     def test_consumer_offset_out_of_range(self) -> None:
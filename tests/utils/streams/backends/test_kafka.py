@@ -54,10 +54,19 @@ class KafkaStreamsTestCase(StreamsTestMixin[KafkaPayload], TestCase):
 
     configuration = get_default_kafka_configuration()
 
+    admin_client: AdminClient
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        # Creating an admin client requires a metadata round trip to the
+        # broker, so share one across all of the tests in this case.
+        cls.admin_client = AdminClient(cls.configuration)
+
     @contextlib.contextmanager
     def get_topic(self, partitions: int = 1) -> Iterator[Topic]:
         name = f"test-{uuid.uuid1().hex}"
-        client = AdminClient(self.configuration)
+        client = self.admin_client
         [[key, future]] = client.create_topics(
             [NewTopic(name, num_partitions=partitions, replication_factor=1)]
         ).items()